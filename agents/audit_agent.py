@@ -9,7 +9,6 @@ import pandas as pd
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import google.generativeai as genai
-from dotenv import load_dotenv
 
 from agents.base_agent import BaseAgent
 from state import (
@@ -17,8 +16,9 @@ from state import (
     ValidationStatus, RiskLevel
 )
 from utils.logger import StructuredLogger
+from utils.env import load_environment
 
-load_dotenv()
+load_environment()
 
 
 class AuditAgent(BaseAgent):
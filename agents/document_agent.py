@@ -4,12 +4,18 @@ Handles PDF extraction, text processing, and AI-powered invoice parsing
 """
 
 import os
+import re
 import json
+import asyncio
+import weakref
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import fitz  # PyMuPDF
 import pdfplumber
 from typing import Dict, Any, Optional, List
 import google.generativeai as genai
-from dotenv import load_dotenv
 
 from agents.base_agent import BaseAgent
 from state import (
@@ -17,8 +23,30 @@ from state import (
     ProcessingStatus, ValidationStatus
 )
 from utils.logger import StructuredLogger
+from utils.env import load_environment
 
-load_dotenv()
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers are unchanged
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+load_environment()
+
+
+@functools.lru_cache(maxsize=4)
+def _get_generative_model(model_name: str) -> genai.GenerativeModel:
+    """Return a shared Gemini model instance per model name"""
+    return genai.GenerativeModel(model_name)
+
+
+def _extract_page_block(file_path: str, start: int, stop: int) -> str:
+    """Extract text from pages [start, stop) of a PDF; runs in a worker process"""
+    text = ""
+    with fitz.open(file_path) as doc:
+        for page_number in range(start, stop):
+            text += doc[page_number].get_text()
+    return text
 
 
 class DocumentAgent(BaseAgent):
@@ -37,12 +65,19 @@ class DocumentAgent(BaseAgent):
             raise ValueError("GEMINI_API_KEY_1 not found in environment variables")
         
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        self.model = _get_generative_model("gemini-2.0-flash")
         
         # Configuration
         self.extraction_methods = config.get("extraction_methods", ["pymupdf", "pdfplumber"])
         self.ai_confidence_threshold = config.get("ai_confidence_threshold", 0.7)
         self.max_text_length = config.get("max_text_length", 10000)
+        self.pdf_workers = config.get("pdf_workers", min(os.cpu_count() or 1, 4))
+        self.pdf_page_block_size = config.get("pdf_page_block_size", 8)
+        self.pdf_parallel_min_pages = config.get("pdf_parallel_min_pages", 64)
+        
+        # Long-lived PDF worker pool, created on first large document
+        self._pdf_pool = None
+        self._pdf_pool_finalizer = None
     
     def _validate_preconditions(self, state: InvoiceProcessingState) -> bool:
         """Validate that we have a file to process"""
@@ -118,10 +153,7 @@ class DocumentAgent(BaseAgent):
         # Method 1: PyMuPDF
         if "pymupdf" in self.extraction_methods:
             try:
-                text = ""
-                with fitz.open(file_path) as doc:
-                    for page in doc:
-                        text += page.get_text()
+                text = await self._extract_text_with_pymupdf(file_path)
                 if text.strip():
                     extracted_texts.append(("pymupdf", text))
             except Exception as e:
@@ -155,6 +187,59 @@ class DocumentAgent(BaseAgent):
         
         return best_text
     
+    async def _extract_text_with_pymupdf(self, file_path: str) -> str:
+        """
+        Extract text with PyMuPDF, spreading large documents across worker processes
+        """
+        with fitz.open(file_path) as doc:
+            page_count = len(doc)
+            # Typical invoices are far cheaper to extract inline than to ship to a pool
+            if page_count < self.pdf_parallel_min_pages or self.pdf_workers <= 1:
+                return "".join(page.get_text() for page in doc)
+        
+        # Hand out contiguous page blocks rather than single pages to limit IPC
+        blocks = [
+            (start, min(start + self.pdf_page_block_size, page_count))
+            for start in range(0, page_count, self.pdf_page_block_size)
+        ]
+        
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            try:
+                pool = self._get_pdf_pool()
+                texts = await asyncio.gather(*[
+                    loop.run_in_executor(pool, _extract_page_block, file_path, start, stop)
+                    for start, stop in blocks
+                ])
+                return "".join(texts)
+            except BrokenProcessPool:
+                # A worker died (MuPDF crash, OOM kill); drop the pool so the next call rebuilds it
+                self.shutdown()
+                if attempt:
+                    raise
+                self.logger.warning("PDF worker pool broke; restarting it and retrying once")
+    
+    def _get_pdf_pool(self) -> ProcessPoolExecutor:
+        """
+        Return the agent's PDF worker pool, creating it on first use
+        Workers are spawned rather than forked because the host (Streamlit) is multi-threaded
+        """
+        if self._pdf_pool is None:
+            self._pdf_pool = ProcessPoolExecutor(
+                max_workers=self.pdf_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            # Shut the pool down with the agent
+            self._pdf_pool_finalizer = weakref.finalize(self, self._pdf_pool.shutdown, wait=False)
+        return self._pdf_pool
+    
+    def shutdown(self):
+        """Release the PDF worker pool, if one was started"""
+        if self._pdf_pool_finalizer is not None:
+            self._pdf_pool_finalizer()
+        self._pdf_pool = None
+        self._pdf_pool_finalizer = None
+    
     async def _parse_invoice_with_ai(self, text: str) -> InvoiceData:
         """
         Parse invoice text using Gemini AI
@@ -208,7 +293,7 @@ Invoice text:
                 content = content.replace("```", "").strip()
             
             # Parse JSON
-            parsed_data = json.loads(content)
+            parsed_data = json_loads(content)
             
             # Convert to InvoiceData model
             item_details = [
@@ -246,7 +331,6 @@ Invoice text:
         # Validate required fields
         if not invoice_data.invoice_number:
             # Try to extract invoice number using regex patterns
-            import re
             patterns = [
                 r"Invoice\s*#?\s*:?\s*(\w+)",
                 r"Invoice\s*Number\s*:?\s*(\w+)",
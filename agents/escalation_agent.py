@@ -11,7 +11,6 @@ from email.mime.multipart import MIMEMultipart
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import google.generativeai as genai
-from dotenv import load_dotenv
 
 from agents.base_agent import BaseAgent
 from state import (
@@ -19,8 +18,9 @@ from state import (
     RiskLevel, ValidationStatus
 )
 from utils.logger import StructuredLogger
+from utils.env import load_environment
 
-load_dotenv()
+load_environment()
 
 
 class EscalationAgent(BaseAgent):
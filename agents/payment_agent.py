@@ -5,11 +5,11 @@ Handles payment decisions, processing, and transaction management
 
 import os
 import json
+import asyncio
 import requests
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import google.generativeai as genai
-from dotenv import load_dotenv
 
 from agents.base_agent import BaseAgent
 from state import (
@@ -17,8 +17,9 @@ from state import (
     RiskLevel, ValidationStatus, ProcessingStatus
 )
 from utils.logger import StructuredLogger
+from utils.env import load_environment
 
-load_dotenv()
+load_environment()
 
 
 class PaymentAgent(BaseAgent):
@@ -316,7 +317,6 @@ class PaymentAgent(BaseAgent):
     
     async def _async_sleep(self, seconds: int):
         """Async sleep for retry delays"""
-        import asyncio
         await asyncio.sleep(seconds)
     
     def _update_payment_decision(self, payment_decision: PaymentDecision, 
@@ -8,7 +8,6 @@ import json
 import re
 from typing import Dict, Any, List
 import google.generativeai as genai
-from dotenv import load_dotenv
 import numpy as np
 from datetime import datetime, timedelta
 
@@ -18,8 +17,18 @@ from state import (
     ValidationStatus, ProcessingStatus
 )
 from utils.logger import StructuredLogger
+from utils.env import load_environment
 
-load_dotenv()
+load_environment()
+
+
+# Risk contribution for each validation outcome
+VALIDATION_STATUS_RISK = {
+    ValidationStatus.INVALID: 0.4,
+    ValidationStatus.REQUIRES_APPROVAL: 0.3,
+    ValidationStatus.PARTIAL_MATCH: 0.2,
+}
+MISSING_PO_RISK = 0.5
 
 
 class RiskAgent(BaseAgent):
@@ -171,14 +180,10 @@ class RiskAgent(BaseAgent):
         risk_factors.append(amount_risk * 0.3)
         
         # Validation-based risk
-        if validation_result.validation_status == ValidationStatus.INVALID:
-            risk_factors.append(0.4)
-        elif validation_result.validation_status == ValidationStatus.REQUIRES_APPROVAL:
-            risk_factors.append(0.3)
-        elif validation_result.validation_status == ValidationStatus.PARTIAL_MATCH:
-            risk_factors.append(0.2)
+        if validation_result.validation_status in VALIDATION_STATUS_RISK:
+            risk_factors.append(VALIDATION_STATUS_RISK[validation_result.validation_status])
         elif not validation_result.po_found:
-            risk_factors.append(0.5)
+            risk_factors.append(MISSING_PO_RISK)
         else:
             risk_factors.append(0.0)
         
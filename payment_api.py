@@ -7,6 +7,7 @@ from fastapi import FastAPI, Request, HTTPException
 from pydantic import BaseModel
 from datetime import datetime
 import random
+import time
 import uvicorn
 import logging
 
@@ -66,7 +67,6 @@ async def initiate_payment(payment_request: PaymentRequest):
     logger.info(f"Processing payment for {payment_request.customer_name}: ${payment_request.amount}")
     
     # Simulate processing delay
-    import time
     time.sleep(0.1)  # Small delay to simulate processing
     
     # Generate transaction ID
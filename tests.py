@@ -1,21 +1,25 @@
 """
 Core Unit Tests for Invoice AgenticAI - LangGraph
-- Maximum 10 test cases
-- 2 REAL API calls (validation, risk assessment)
-- 8 MOCKED tests to save API quota
+- Gemini calls are mocked to save API quota
+- Test names mark REAL API and MOCKED cases; the rest run on local files,
+  worker processes and the in-process payment API
 """
 import os
+import copy
+import json
 import tempfile
 import asyncio
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
 from unittest.result import TestResult
-from dotenv import load_dotenv
 import pandas as pd
+import fitz  # PyMuPDF
 from datetime import datetime
 
-from agents.document_agent import DocumentAgent
-from agents.validation_agent import ValidationAgent
+from agents.document_agent import DocumentAgent, _extract_page_block, _get_generative_model
+from agents.validation_agent import ValidationAgent, _load_po_csv
 from agents.risk_agent import RiskAgent
 from agents.payment_agent import PaymentAgent
 from graph import InvoiceProcessingGraph
@@ -25,11 +29,36 @@ from state import (
     ValidationResult, ValidationStatus, RiskAssessment
 )
 
-# Import test client for FastAPI
-from fastapi.testclient import TestClient
+# In-process ASGI client for the FastAPI payment service
+import httpx
 from payment_api import app
+from utils.env import load_environment
+
+load_environment()
+
+# Smallest well-formed single-page PDF, written once as a shared fixture
+MINIMAL_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n"
+    b"2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n"
+    b"3 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] >>\nendobj\n"
+    b"xref\n0 4\n"
+    b"0000000000 65535 f \n"
+    b"0000000009 00000 n \n"
+    b"0000000058 00000 n \n"
+    b"0000000115 00000 n \n"
+    b"trailer\n<< /Size 4 /Root 1 0 R >>\n"
+    b"startxref\n186\n%%EOF\n"
+)
+
+
+class _FakePdfDocument(list):
+    """Cheap stand-in for a PyMuPDF document: a list of pages usable as a context manager"""
+    def __enter__(self):
+        return self
 
-load_dotenv()
+    def __exit__(self, *exc_info):
+        return None
 
 
 class TestResultSummary(TestResult):
@@ -40,6 +69,17 @@ class TestResultSummary(TestResult):
         self.success_count = 0
         self.failure_count = 0
         self.error_count = 0
+        self._unsuccessful_test_ids = set()
+
+    def _count_unsuccessful(self, test, is_failure):
+        """Count each test at most once, however many of its subtests fail"""
+        if test.id() in self._unsuccessful_test_ids:
+            return
+        self._unsuccessful_test_ids.add(test.id())
+        if is_failure:
+            self.failure_count += 1
+        else:
+            self.error_count += 1
 
     def startTest(self, test):
         super().startTest(test)
@@ -51,11 +91,16 @@ class TestResultSummary(TestResult):
 
     def addError(self, test, err):
         super().addError(test, err)
-        self.error_count += 1
+        self._count_unsuccessful(test, is_failure=False)
 
     def addFailure(self, test, err):
         super().addFailure(test, err)
-        self.failure_count += 1
+        self._count_unsuccessful(test, is_failure=True)
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            self._count_unsuccessful(test, is_failure=issubclass(err[0], test.failureException))
 
     def get_counts(self):
         return {
@@ -67,24 +112,130 @@ class TestResultSummary(TestResult):
 
 
 class TestInvoiceAgenticAI(unittest.TestCase):
-    """Core test suite with 10 essential tests (2 real API, 8 mocked)"""
+    """Core test suite for agents, state models and the payment API"""
+
+    # Canned AI response, serialized once at class definition
+    ai_response_text = json.dumps({
+        "invoice_number": "INV-001",
+        "order_id": "ORD-001",
+        "customer_name": "Test Customer",
+        "total": 110.0,
+        "item_details": [{"item_name": "Test Item", "quantity": 1, "rate": 100.0, "amount": 100.0}]
+    })
+
+    @classmethod
+    def setUpClass(cls):
+        """Parse shared fixtures once for the whole suite"""
+        cls.po_data = pd.read_csv("data/purchase_orders.csv")
+        cls.po_cols = frozenset(cls.po_data.columns)
+        cls.loop = asyncio.new_event_loop()
+        cls.addClassCleanup(cls.loop.close)
+
+        fd, cls.sample_pdf = tempfile.mkstemp(suffix='.pdf')
+        cls.addClassCleanup(os.unlink, cls.sample_pdf)
+        os.write(fd, MINIMAL_PDF)
+        os.close(fd)
+
+        # Agents are built on first use, so tests that need no API key still run
+        cls._agents = {}
+
+        # One in-process ASGI client (no sockets) shared by every API test.
+        # ASGITransport does not run lifespan events; the payment app defines none.
+        cls.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        cls.addClassCleanup(lambda: cls.loop.run_until_complete(cls.client.aclose()))
+
+    @classmethod
+    def _shared_agent(cls, agent_cls, config):
+        """Build each agent type once per class, on first use"""
+        if agent_cls not in cls._agents:
+            cls._agents[agent_cls] = agent_cls(config)
+        return cls._agents[agent_cls]
+
+    @property
+    def doc_agent(self):
+        return self._shared_agent(DocumentAgent, {
+            "extraction_methods": ["pymupdf", "pdfplumber"],
+            "ai_confidence_threshold": 0.7
+        })
 
-    # TEST 1: REAL API - Purchase Order Validation
-    def test_1_purchase_order_validation_real(self):
-        """Test 1: REAL API - Invoice validation against purchase orders"""
-        config = {
+    @property
+    def val_agent(self):
+        return self._shared_agent(ValidationAgent, {
             "po_file_path": "data/purchase_orders.csv",
             "fuzzy_threshold": 80,
             "amount_tolerance": 0.05
-        }
-        agent = ValidationAgent(config)
+        })
+
+    @property
+    def risk_agent(self):
+        return self._shared_agent(RiskAgent, {
+            "risk_thresholds": {
+                "low": 0.3,
+                "medium": 0.6,
+                "high": 0.8,
+                "critical": 0.9
+            }
+        })
+
+    @property
+    def pay_agent(self):
+        return self._shared_agent(PaymentAgent, {
+            "payment_api_url": "http://localhost:8000/initiate_payment",
+            "auto_payment_threshold": 5000,
+            "manual_approval_threshold": 25000
+        })
+
+    def _run(self, coro):
+        """Run a coroutine on the shared event loop"""
+        return self.loop.run_until_complete(coro)
+
+    @staticmethod
+    async def _all_api_checks(client, payment_request):
+        """Issue the health and payment requests concurrently"""
+        health, payment = await asyncio.gather(
+            client.get("/health"),
+            client.post("/initiate_payment", json=payment_request)
+        )
+        return health, payment
+
+    def _write_multipage_pdf(self, page_count):
+        """Write a real PDF with one line of text per page and return its path"""
+        fd, pdf_path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        self.addCleanup(os.unlink, pdf_path)
+
+        with fitz.open() as doc:
+            for n in range(page_count):
+                doc.new_page().insert_text((72, 72), f"Page {n} text")
+            doc.save(pdf_path)
+        return pdf_path
+
+    def _pooled_doc_agent(self):
+        """Copy of the shared document agent that sends every PDF to its worker pool"""
+        agent = copy.copy(self.doc_agent)
+        agent.pdf_workers = 2
+        agent.pdf_page_block_size = 2
+        agent.pdf_parallel_min_pages = 1
+        self.addCleanup(agent.shutdown)
+        return agent
+
+    @staticmethod
+    def _make_invoice(item_details=(), **fields):
+        """Build trusted InvoiceData fixtures without running Pydantic validation"""
+        items = [ItemDetail.model_construct(**item) for item in item_details]
+        return InvoiceData.model_construct(item_details=items, **fields)
+
+    # TEST 1: REAL API - Purchase Order Validation
+    def test_1_purchase_order_validation_real(self):
+        """Test 1: REAL API - Invoice validation against purchase orders"""
+        agent = self.val_agent
 
         # Load and test the purchase orders data
-        po_data = pd.read_csv("data/purchase_orders.csv")
+        po_data = self.po_data
         self.assertIsNotNone(po_data)
         self.assertGreater(len(po_data), 0)
-        self.assertIn("invoice_number", po_data.columns)
-        self.assertIn("customer_name", po_data.columns)
+        self.assertIn("invoice_number", self.po_cols)
+        self.assertIn("customer_name", self.po_cols)
 
         # Test data loading functionality
         loaded_data = agent._load_purchase_orders()
@@ -95,30 +246,21 @@ class TestInvoiceAgenticAI(unittest.TestCase):
     # TEST 2: REAL API - Risk Assessment
     def test_2_risk_assessment_real(self):
         """Test 2: REAL API - Risk assessment functionality"""
-        config = {
-            "risk_thresholds": {
-                "low": 0.3,
-                "medium": 0.6,
-                "high": 0.8,
-                "critical": 0.9
-            }
-        }
-        agent = RiskAgent(config)
+        agent = self.risk_agent
 
         # Create sample invoice data
-        item = ItemDetail(item_name="Test Item", quantity=1, rate=50000.0, amount=50000.0)
-        invoice_data = InvoiceData(
+        invoice_data = self._make_invoice(
             invoice_number="INV-999",
             order_id="ORD-999",
             customer_name="New Customer",
             total=50000.0,
-            item_details=[item]
+            item_details=[{"item_name": "Test Item", "quantity": 1, "rate": 50000.0, "amount": 50000.0}]
         )
 
         validation_result = ValidationResult(validation_status=ValidationStatus.VALID)
 
         # REAL API call to calculate risk score
-        risk_assessment = asyncio.run(agent._calculate_base_risk_score(invoice_data, validation_result))
+        risk_assessment = self._run(agent._calculate_base_risk_score(invoice_data, validation_result))
 
         self.assertIsNotNone(risk_assessment)
         self.assertIsInstance(risk_assessment, float)
@@ -128,26 +270,16 @@ class TestInvoiceAgenticAI(unittest.TestCase):
     @patch('fitz.open')
     def test_3_pdf_extraction_mocked(self, mock_fitz):
         """Test 3: MOCKED - PDF text extraction"""
-        config = {
-            "extraction_methods": ["pymupdf", "pdfplumber"],
-            "ai_confidence_threshold": 0.7
-        }
-        agent = DocumentAgent(config)
+        agent = self.doc_agent
 
-        temp_pdf = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_pdf.close()
+        temp_pdf_name = self.sample_pdf
 
         # Mock PDF extraction
-        mock_doc = Mock()
-        mock_page = Mock()
-        mock_page.get_text.return_value = "Test invoice text"
-        mock_doc.__enter__ = Mock(return_value=mock_doc)
-        mock_doc.__exit__ = Mock(return_value=None)
-        mock_doc.__iter__ = Mock(return_value=iter([mock_page]))
-        mock_fitz.return_value = mock_doc
+        mock_page = SimpleNamespace(get_text=lambda: "Test invoice text")
+        mock_fitz.return_value = _FakePdfDocument([mock_page])
 
         with patch('agents.document_agent.os.path.exists', return_value=True):
-            result = asyncio.run(agent._extract_text_from_pdf(temp_pdf.name))
+            result = self._run(agent._extract_text_from_pdf(temp_pdf_name))
 
         self.assertIn("Test invoice text", result)
         print("MOCKED Test 3: PDF extraction passed")
@@ -156,22 +288,23 @@ class TestInvoiceAgenticAI(unittest.TestCase):
     @patch('google.generativeai.GenerativeModel.generate_content')
     def test_4_ai_parsing_mocked(self, mock_ai):
         """Test 4: MOCKED - AI invoice parsing"""
-        config = {"extraction_methods": ["pymupdf"], "ai_confidence_threshold": 0.7}
-        agent = DocumentAgent(config)
+        agent = self.doc_agent
 
-        mock_response = Mock()
-        mock_response.text = '''
-        {
-            "invoice_number": "INV-001",
-            "order_id": "ORD-001",
-            "customer_name": "Test Customer",
-            "total": 110.0,
-            "item_details": [{"item_name": "Test Item", "quantity": 1, "rate": 100.0, "amount": 100.0}]
-        }
-        '''
+        mock_response = SimpleNamespace(text=self.ai_response_text)
         mock_ai.return_value = mock_response
 
-        result = asyncio.run(agent._parse_invoice_with_ai("Test invoice text"))
+        result = self._run(agent._parse_invoice_with_ai("Test invoice text"))
+        mock_ai.assert_called_once()
+
+        # Agents share one cached model per name instead of building their own
+        _get_generative_model.cache_clear()
+        self.addCleanup(_get_generative_model.cache_clear)
+        config = {"extraction_methods": ["pymupdf"], "ai_confidence_threshold": 0.7}
+        with patch('agents.document_agent.genai.GenerativeModel') as mock_model_cls:
+            first_agent = DocumentAgent(config)
+            second_agent = DocumentAgent(config)
+        mock_model_cls.assert_called_once_with("gemini-2.0-flash")
+        self.assertIs(first_agent.model, second_agent.model)
 
         self.assertEqual(result.invoice_number, "INV-001")
         self.assertEqual(result.customer_name, "Test Customer")
@@ -180,26 +313,21 @@ class TestInvoiceAgenticAI(unittest.TestCase):
     # TEST 5: MOCKED - Payment Processing
     def test_5_payment_processing_mocked(self):
         """Test 5: MOCKED - Payment processing logic"""
-        config = {
-            "payment_api_url": "http://localhost:8000/initiate_payment",
-            "auto_payment_threshold": 5000,
-            "manual_approval_threshold": 25000
-        }
-        agent = PaymentAgent(config)
+        agent = self.pay_agent
 
         validation_result = ValidationResult(validation_status=ValidationStatus.VALID)
         risk_assessment = RiskAssessment(risk_level=RiskLevel.LOW)
         state = InvoiceProcessingState(file_name="test.pdf")
 
-        invoice = InvoiceData(
+        invoice = self._make_invoice(
             invoice_number="INV-001",
             order_id="ORD-001",
             customer_name="Test Customer",
             total=100.0,
-            item_details=[ItemDetail(item_name="Test", quantity=1, rate=100.0, amount=100.0)]
+            item_details=[{"item_name": "Test", "quantity": 1, "rate": 100.0, "amount": 100.0}]
         )
 
-        decision = asyncio.run(agent._make_payment_decision(invoice, validation_result, risk_assessment, state))
+        decision = self._run(agent._make_payment_decision(invoice, validation_result, risk_assessment, state))
         self.assertIsNotNone(decision)
         print("MOCKED Test 5: Payment processing passed")
 
@@ -218,7 +346,7 @@ class TestInvoiceAgenticAI(unittest.TestCase):
 
     # TEST 7: State Model Validation
     def test_7_state_model_validation(self):
-        """Test 7: State model functionality"""
+        """Test 7: State model functionality (exercises the validating constructors)"""
         item = ItemDetail(item_name="Test Item", quantity=2, rate=50.0, amount=100.0)
 
         invoice_data = InvoiceData(
@@ -265,77 +393,169 @@ class TestInvoiceAgenticAI(unittest.TestCase):
     # TEST 10: Payment API Endpoints
     def test_10_payment_api_endpoints(self):
         """Test 10: Payment API functionality"""
-        try:
-            # Try to create TestClient - handle version compatibility issues
-            try:
-                client = TestClient(app)
-            except TypeError as e:
-                if "got an unexpected keyword argument 'app'" in str(e):
-                    # Newer Starlette version compatibility
-                    import httpx
-                    from starlette.testclient import TestClient as StarlettTestClient
-                    # Use httpx directly for newer Starlette
-                    with httpx.Client(app=app, base_url="http://test") as client_http:
-                        # Test health endpoint
-                        response = client_http.get("/health")
-                        self.assertEqual(response.status_code, 200)
-
-                        # Test payment endpoint
-                        payment_request = {
-                            "order_id": "ORD-123",
-                            "customer_name": "Test Customer",
-                            "amount": 100.0,
-                            "due_date": "2023-12-31"
-                        }
-
-                        response = client_http.post("/initiate_payment", json=payment_request)
-                        self.assertEqual(response.status_code, 200)
-
-                        data = response.json()
-                        self.assertEqual(data["status"], "SUCCESS")
-                        print("Test 10: Payment API endpoints passed")
-                    return
-                else:
-                    raise
-
-            # Test health endpoint
-            response = client.get("/health")
-            self.assertEqual(response.status_code, 200)
-
-            # Test payment endpoint
-            payment_request = {
-                "order_id": "ORD-123",
-                "customer_name": "Test Customer",
-                "amount": 100.0,
-                "due_date": "2023-12-31"
-            }
+        payment_request = {
+            "order_id": "ORD-123",
+            "customer_name": "Test Customer",
+            "amount": 100.0,
+            "due_date": "2023-12-31"
+        }
 
-            response = client.post("/initiate_payment", json=payment_request)
-            self.assertEqual(response.status_code, 200)
+        # Test health and payment endpoints in one event-loop turn
+        health_response, payment_response = self._run(self._all_api_checks(self.client, payment_request))
+        self.assertEqual(health_response.status_code, 200)
+        self.assertEqual(payment_response.status_code, 200)
 
-            data = response.json()
-            self.assertEqual(data["status"], "SUCCESS")
-            print("Test 10: Payment API endpoints passed")
-        except Exception as e:
-            # If TestClient has version issues, skip this test gracefully
-            print(f"Test 10: Skipped due to Starlette/httpx version compatibility: {str(e)}")
-            self.skipTest("TestClient version compatibility issue")
+        data = payment_response.json()
+        self.assertEqual(data["status"], "SUCCESS")
+        print("Test 10: Payment API endpoints passed")
 
+    # TEST 11: MOCKED - Parallel PDF Extraction
+    @patch('fitz.open')
+    def test_11_pdf_extraction_parallel_mocked(self, mock_fitz):
+        """Test 11: MOCKED - Multi-worker PDF text extraction"""
+        agent = copy.copy(self.doc_agent)
+        agent.pdf_workers = 2
+        agent.pdf_page_block_size = 1
+        agent.pdf_parallel_min_pages = 1
+        self.addCleanup(agent.shutdown)
+
+        pages = [SimpleNamespace(get_text=lambda n=n: f"Page {n} text ") for n in range(3)]
+        mock_fitz.side_effect = lambda *args, **kwargs: _FakePdfDocument(pages)
+
+        # Threads share the patched fitz.open, unlike worker processes
+        thread_pool = lambda max_workers, mp_context=None: ThreadPoolExecutor(max_workers)
+        with patch('agents.document_agent.ProcessPoolExecutor', thread_pool):
+            result = self._run(agent._extract_text_from_pdf(self.sample_pdf))
+
+        self.assertIn("Page 0 text Page 1 text Page 2 text", result)
+        print("MOCKED Test 11: Parallel PDF extraction passed")
+
+    # TEST 12: Fuzzy Purchase Order Matching
+    def test_12_fuzzy_po_matching(self):
+        """Test 12: Fuzzy customer match against purchase orders"""
+        agent = self.val_agent
+
+        # Real order_id with a misspelled customer name skips the exact match
+        invoice_data = self._make_invoice(
+            invoice_number="14021",
+            order_id="ES-2025-BE11335139-41340",
+            customer_name="Bill Eplet"
+        )
 
-if __name__ == "__main__":
-    print("Running corrected Invoice AgenticAI - LangGraph unit tests...")
-    print("Maximum 10 tests: 2 real API calls, 8 mocked\n")
+        matching_pos = self._run(agent._find_matching_pos(invoice_data))
 
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromTestCase(TestInvoiceAgenticAI)
+        self.assertEqual(len(matching_pos), 1)
+        self.assertEqual(matching_pos[0]["match_type"], "fuzzy_customer")
+        self.assertEqual(matching_pos[0]["match_score"], 95)
+        self.assertEqual(matching_pos[0]["po_data"]["customer_name"], "Bill Eplett")
+        print("Test 12: Fuzzy PO matching passed")
+
+    # TEST 13: Real Multi-page PDF Block Extraction
+    def test_13_pdf_page_block_extraction(self):
+        """Test 13: Page-block extraction on a real PDF, inline and in worker processes"""
+        pdf_path = self._write_multipage_pdf(4)
+
+        # Direct block extraction honours the [start, stop) range
+        block_text = _extract_page_block(pdf_path, 1, 3)
+        self.assertIn("Page 1 text", block_text)
+        self.assertIn("Page 2 text", block_text)
+        self.assertNotIn("Page 0 text", block_text)
+        self.assertNotIn("Page 3 text", block_text)
+
+        # Real spawned workers: pickles the job and imports the agent module
+        agent = self._pooled_doc_agent()
+
+        text = self._run(agent._extract_text_with_pymupdf(pdf_path))
+        positions = [text.index(f"Page {n} text") for n in range(4)]
+        self.assertEqual(positions, sorted(positions))
+        print("Test 13: PDF page-block extraction passed")
 
-    # Run with custom result tracker
+    # TEST 14: Fraud Indicator Detection
+    def test_14_fraud_indicators(self):
+        """Test 14: Suspicious customer names raise fraud indicators"""
+        agent = self.risk_agent
+
+        template = self._make_invoice(
+            invoice_number="INV-999",
+            order_id="ORD-999",
+            customer_name="New Customer",
+            total=500.0,
+            item_details=[{"item_name": "Test Item", "quantity": 1, "rate": 500.0, "amount": 500.0}]
+        )
+        validation_result = ValidationResult(validation_status=ValidationStatus.VALID)
+
+        # Suspicious customers reuse the template invoice and the shared event loop
+        suspicious_customers = ["Urgent Payment Services", "Confidential Invoice Group", "Rush Order Supplies"]
+        for customer in suspicious_customers:
+            with self.subTest(customer=customer):
+                suspicious_invoice = template.model_copy(update={"customer_name": customer})
+                indicators = self._run(agent._detect_fraud_indicators(suspicious_invoice, validation_result))
+                self.assertTrue(any("Suspicious pattern" in indicator for indicator in indicators))
+        print("Test 14: Fraud indicator detection passed")
+
+    # TEST 15: Memory-mapped PO CSV Loading
+    def test_15_po_csv_mmap_loading(self):
+        """Test 15: mmap and plain reads of the PO CSV produce the same frame"""
+        po_path = "data/purchase_orders.csv"
+        po_stat = os.stat(po_path)
+
+        # Call the uncached loader so both branches really parse the file
+        plain_df = _load_po_csv.__wrapped__(po_path, po_stat.st_mtime_ns, po_stat.st_size)
+        with patch('agents.validation_agent.MMAP_MIN_BYTES', 0):
+            mmap_df = _load_po_csv.__wrapped__(po_path, po_stat.st_mtime_ns, po_stat.st_size)
+
+        pd.testing.assert_frame_equal(mmap_df, plain_df)
+        print("Test 15: Memory-mapped PO CSV loading passed")
+
+    # TEST 16: PDF Worker Pool Recovery
+    def test_16_pdf_pool_recovers_from_dead_worker(self):
+        """Test 16: A killed PDF worker does not break later extractions"""
+        pdf_path = self._write_multipage_pdf(4)
+        agent = self._pooled_doc_agent()
+
+        self._run(agent._extract_text_with_pymupdf(pdf_path))
+        broken_pool = agent._pdf_pool
+
+        # Simulate a MuPDF segfault / OOM kill of every worker
+        for process in list(broken_pool._processes.values()):
+            process.kill()
+            process.join()
+
+        text = self._run(agent._extract_text_with_pymupdf(pdf_path))
+        self.assertIn("Page 3 text", text)
+        self.assertIsNot(agent._pdf_pool, broken_pool)
+        print("Test 16: PDF worker pool recovery passed")
+
+
+def _run_test_batch(test_names):
+    """Run a batch of test methods as one suite in a worker process and return its counts"""
+    suite = unittest.TestLoader().loadTestsFromNames(
+        [f"tests.TestInvoiceAgenticAI.{name}" for name in test_names]
+    )
     result = TestResultSummary()
     suite.run(result)
+    return result.get_counts()
+
+
+if __name__ == "__main__":
+    print("Running corrected Invoice AgenticAI - LangGraph unit tests...\n")
+
+    # Collect test methods; each worker process keeps its own caches
+    loader = unittest.TestLoader()
+    test_names = loader.getTestCaseNames(TestInvoiceAgenticAI)
+
+    # One batch per worker so setUpClass fixtures are built once per process
+    workers = min(os.cpu_count() or 1, 4, len(test_names))
+    batches = [test_names[i::workers] for i in range(workers)]
+
+    # Run batches in parallel and merge the per-batch counts
+    counts = {'total': 0, 'passed': 0, 'failed': 0, 'errors': 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for test_counts in pool.map(_run_test_batch, batches):
+            for key in counts:
+                counts[key] += test_counts[key]
 
     # Print summary
-    counts = result.get_counts()
     print("\n" + "="*60)
     print("TEST SUMMARY")
     print("="*60)
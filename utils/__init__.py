@@ -3,6 +3,7 @@ Utility Modules for Invoice Processing Workflow
 
 Contains:
 - logger.py: Structured logging utilities
+- env.py: One-time .env loading
 """
 
 __all__ = []
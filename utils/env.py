@@ -0,0 +1,15 @@
+"""
+Environment Loading Utility for Invoice Processing System
+Loads .env configuration once per process
+"""
+
+import functools
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=1)
+def load_environment() -> bool:
+    """Load variables from .env; repeated calls are no-ops"""
+    load_dotenv()
+    return True